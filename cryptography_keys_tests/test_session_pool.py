@@ -0,0 +1,138 @@
+class StubSession:
+    def __init__(self, dead: bool = False):
+        from PyKCS11 import CKR_SESSION_HANDLE_INVALID, PyKCS11Error
+
+        self._dead = dead
+        self._error = PyKCS11Error(CKR_SESSION_HANDLE_INVALID)
+        self.logged_out = False
+        self.closed = False
+
+    def getSessionInfo(self):
+        if self._dead:
+            raise self._error
+        return object()
+
+    def login(self, pin, user_type=None):
+        pass
+
+    def logout(self):
+        self.logged_out = True
+
+    def closeSession(self):
+        self.closed = True
+
+
+class TestSessionPool:
+    def test_checkout_empty(self):
+        from pkcs11_cryptography_keys import PKCS11SessionPool
+
+        pool = PKCS11SessionPool()
+        assert pool.checkout(("lib", "token", 1)) is None
+
+    def test_checkin_checkout_roundtrip(self):
+        from pkcs11_cryptography_keys import PKCS11SessionPool
+
+        pool = PKCS11SessionPool()
+        key = ("lib", "token", 1)
+        session = StubSession()
+        pool.checkin(key, session)
+        assert pool.checkout(key) is session
+        assert pool.checkout(key) is None
+
+    def test_checkout_discards_dead_sessions(self):
+        from pkcs11_cryptography_keys import PKCS11SessionPool
+
+        pool = PKCS11SessionPool()
+        key = ("lib", "token", 1)
+        dead = StubSession(dead=True)
+        live = StubSession()
+        pool.checkin(key, dead)
+        pool.checkin(key, live)
+        assert pool.checkout(key) is live
+
+    def test_keys_are_separate(self):
+        from pkcs11_cryptography_keys import PKCS11SessionPool
+
+        pool = PKCS11SessionPool()
+        session = StubSession()
+        pool.checkin(("lib", "token", 1), session)
+        assert pool.checkout(("lib", "other", 1)) is None
+        assert pool.checkout(("lib", "token", 1)) is session
+
+    def test_clear_closes_idle_sessions(self):
+        from pkcs11_cryptography_keys import PKCS11SessionPool
+
+        pool = PKCS11SessionPool()
+        key = ("lib", "token", 1)
+        session = StubSession()
+        pool.checkin(key, session)
+        pool.clear()
+        assert session.closed
+        assert pool.checkout(key) is None
+
+    def test_close_checks_in_on_clean_exit(self):
+        from pkcs11_cryptography_keys.sessions.PKCS11_session import (
+            PKCS11Session,
+        )
+        from pkcs11_cryptography_keys.sessions.PKCS11_session_pool import (
+            PKCS11SessionPool,
+        )
+
+        pool = PKCS11SessionPool.instance()
+        pool.clear()
+        key = ("lib", "token", 1)
+        wrapper = PKCS11Session(None)
+        session = StubSession()
+        wrapper._session = session
+        wrapper._pool_key = key
+        wrapper.close()
+        assert not session.closed
+        assert pool.checkout(key) is session
+        pool.clear()
+
+    def test_close_discards_on_exception_exit(self):
+        from pkcs11_cryptography_keys.sessions.PKCS11_session import (
+            PKCS11Session,
+        )
+        from pkcs11_cryptography_keys.sessions.PKCS11_session_pool import (
+            PKCS11SessionPool,
+        )
+
+        pool = PKCS11SessionPool.instance()
+        pool.clear()
+        key = ("lib", "token", 1)
+        wrapper = PKCS11Session(None)
+        session = StubSession()
+        wrapper._session = session
+        wrapper._pool_key = key
+        wrapper._login_required = True
+        wrapper.close(discard=True)
+        assert session.logged_out
+        assert session.closed
+        assert pool.checkout(key) is None
+        assert wrapper._session is None
+        assert wrapper._pool_key is None
+
+    def test_login_session_tolerates_logged_in_token(self):
+        import pytest
+        from PyKCS11 import (
+            CKR_PIN_INCORRECT,
+            CKR_USER_ALREADY_LOGGED_IN,
+            PyKCS11Error,
+        )
+
+        from pkcs11_cryptography_keys.sessions.PKCS11_session_pool import (
+            login_session,
+        )
+
+        class LoggedInSession:
+            def login(self, pin, user_type=None):
+                raise PyKCS11Error(CKR_USER_ALREADY_LOGGED_IN)
+
+        class BadPinSession:
+            def login(self, pin, user_type=None):
+                raise PyKCS11Error(CKR_PIN_INCORRECT)
+
+        login_session(LoggedInSession(), "1234")
+        with pytest.raises(PyKCS11Error):
+            login_session(BadPinSession(), "1234")
@@ -0,0 +1,60 @@
+uri_key = "pkcs11:model=SoftHSM%20v2;manufacturer=SoftHSM%20project;token=A%20token;id=%01;object=Test%20key?module-path=/usr/lib/softhsm/libsofthsm2.so;pin-value=1234"
+uri = "pkcs11:model=SoftHSM%20v2;manufacturer=SoftHSM%20project;token=A%20token?module-path=/usr/lib/softhsm/libsofthsm2.so;pin-value=1234"
+
+
+class TestURIParse:
+    def test_parse_key_uri(self):
+        from pkcs11_cryptography_keys.pkcs11_URI.pkcs11_URI import PKCS11URI
+
+        parsed = PKCS11URI.parse(uri_key, None)
+        assert parsed._location == {
+            "model": "SoftHSM v2",
+            "manufacturer": "SoftHSM project",
+            "token": "A token",
+            "id": "\x01",
+            "object": "Test key",
+        }
+        assert parsed._query == {
+            "module-path": "/usr/lib/softhsm/libsofthsm2.so",
+            "pin-value": "1234",
+        }
+
+    def test_parse_token_uri(self):
+        from pkcs11_cryptography_keys.pkcs11_URI.pkcs11_URI import PKCS11URI
+
+        parsed = PKCS11URI.parse(uri, None)
+        assert parsed._location == {
+            "model": "SoftHSM v2",
+            "manufacturer": "SoftHSM project",
+            "token": "A token",
+        }
+        assert parsed._query == {
+            "module-path": "/usr/lib/softhsm/libsofthsm2.so",
+            "pin-value": "1234",
+        }
+
+    def test_parse_location_only(self):
+        from pkcs11_cryptography_keys.pkcs11_URI.pkcs11_URI import PKCS11URI
+
+        parsed = PKCS11URI.parse("pkcs11:token=A%20token;id=%01", None)
+        assert parsed._location == {"token": "A token", "id": "\x01"}
+        assert parsed._query == {}
+
+    def test_parse_other_schema(self):
+        from pkcs11_cryptography_keys.pkcs11_URI.pkcs11_URI import PKCS11URI
+
+        parsed = PKCS11URI.parse("https://example.com?token=A", None)
+        assert parsed._location == {}
+        assert parsed._query == {}
+
+    def test_parse_malformed(self):
+        import pytest
+
+        from pkcs11_cryptography_keys.pkcs11_URI.pkcs11_URI import PKCS11URI
+
+        with pytest.raises(Exception):
+            PKCS11URI.parse("pkcs11:token", None)
+        with pytest.raises(Exception):
+            PKCS11URI.parse("pkcs11:token=x;", None)
+        with pytest.raises(Exception):
+            PKCS11URI.parse("pkcs11:token=x?bad", None)
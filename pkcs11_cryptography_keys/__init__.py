@@ -31,6 +31,9 @@ from pkcs11_cryptography_keys.sessions.PKCS11_admin_session import (
 from pkcs11_cryptography_keys.sessions.PKCS11_key_session import (
     PKCS11KeySession as PKCS11KeySession,
 )
+from pkcs11_cryptography_keys.sessions.PKCS11_session_pool import (
+    PKCS11SessionPool as PKCS11SessionPool,
+)
 from pkcs11_cryptography_keys.sessions.PKCS11_slot_admin_session import (
     PKCS11SlotAdminSession as PKCS11SlotAdminSession,
 )
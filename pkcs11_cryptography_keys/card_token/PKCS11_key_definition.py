@@ -80,10 +80,29 @@ _key_usage = {
 }
 
 
+def _build_key_usage_templates() -> (
+    dict[KeyObjectTypes, tuple[list[int], list[str]]]
+):
+    templates: dict[KeyObjectTypes, tuple[list[int], list[str]]] = {}
+    for tag, usages in _key_usage.items():
+        atr_template = []
+        usage_list = []
+        for k, v in usages.items():
+            atr_template.append(v)
+            usage_list.append(k.name.lower())
+        templates[tag] = (atr_template, usage_list)
+    return templates
+
+
+# attribute templates and usage names per key class, built once at import
+_KEY_USAGE_TEMPLATES = _build_key_usage_templates()
+
+
 def to_biginteger_bytes(value: int) -> bytes:
-    value = int(value)
-    bit_length = value.bit_length() + 7
-    return value.to_bytes(bit_length // 8, byteorder="big")
+    if not isinstance(value, int):
+        value = int(value)
+    length = (value.bit_length() + 7) >> 3 or 1
+    return value.to_bytes(length, byteorder="big")
 
 
 class PKCS11KeyUsage(object):
@@ -101,6 +120,8 @@ class PKCS11KeyUsage(object):
         self._usage[OperationTypes.WRAP] = wrap
         self._usage[OperationTypes.DERIVE] = derive
         self._usage[OperationTypes.RECOVER] = recover
+        # frozen view of the usage for fast comparison and hashing
+        self._signature = (crypt, sign, wrap, derive, recover)
 
     @classmethod
     def from_X509_KeyUsage(cls, key_usage: KeyUsage):
@@ -157,16 +178,13 @@ class PKCS11KeyUsage(object):
         return usages
 
     def __eq__(self, value: object) -> bool:
-        ret = False
-        if isinstance(value, PKCS11KeyUsage):
-            ret = True
-            for k, v in value._usage.items():
-                if k in self._usage:
-                    if v != self._usage[k]:
-                        ret = False
-                else:
-                    ret = False
-        return ret
+        return (
+            isinstance(value, PKCS11KeyUsage)
+            and self._signature == value._signature
+        )
+
+    def __hash__(self) -> int:
+        return hash(self._signature)
 
 
 class PKCS11KeyUsageAll(PKCS11KeyUsage):
@@ -209,11 +227,7 @@ def read_key_usage_from_key(session, key_ref) -> PKCS11KeyUsage | None:
         and class_attr[0] in _key_classes
     ):
         tag = _key_classes[class_attr[0]]
-        atr_template = []
-        usage_list = []
-        for k, v in _key_usage[tag].items():
-            atr_template.append(v)
-            usage_list.append(str(k).replace("OperationTypes.", "").lower())
+        atr_template, usage_list = _KEY_USAGE_TEMPLATES[tag]
         attrs = session.getAttributeValue(key_ref, atr_template)
         rezult = dict(zip(usage_list, attrs))
         return PKCS11KeyUsage(**rezult)
@@ -4,6 +4,7 @@ from logging import Logger, getLogger
 from re import compile
 from typing import Any
 from urllib.parse import unquote
+from weakref import WeakKeyDictionary
 
 from PyKCS11 import (
     CKA_CLASS,
@@ -15,10 +16,15 @@ from PyKCS11 import (
     CKF_SERIAL_SESSION,
     CKF_TOKEN_INITIALIZED,
     CKU_SO,
-    PyKCS11Lib,
     Session,
 )
 
+from pkcs11_cryptography_keys.sessions.PKCS11_session_pool import (
+    get_library,
+    login_session,
+)
+from pkcs11_cryptography_keys.utils.conversions import as_bytes
+from pkcs11_cryptography_keys.utils.mechanisms import get_mechanism_flag_table
 from pkcs11_cryptography_keys.utils.pin_4_token import Pin4Token, PinTypes
 
 from .definitions import (
@@ -29,6 +35,35 @@ from .definitions import (
     PKCS11_type_translation,
 )
 
+# compiled once, splits an URI into location, query and fragment
+_URI_RE = compile(r"(.+?)(\?.+?)?(#.+)?$")
+
+
+# percent-decode only when there is something to decode
+def _maybe_unquote(value: str) -> str:
+    return unquote(value) if "%" in value else value
+
+
+def _get_object_value(value: str):
+    return value
+
+
+def _get_id_value(value: str):
+    return bytes(value, "UTF-8")
+
+
+def _get_type_value(value: str):
+    return PKCS11_type_translation.get(value, None)
+
+
+# translation of URI key attributes to PKCS11 template entries,
+# shared by all PKCS11URI instances
+_PKCS11_KEY_TRANSLATION = {
+    "object": (CKA_LABEL, _get_object_value),
+    "id": (CKA_ID, _get_id_value),
+    "type": (CKA_CLASS, _get_type_value),
+}
+
 
 class PKCS11URI(object):
     def __init__(
@@ -37,25 +72,14 @@ class PKCS11URI(object):
         query: dict[str, str],
         logger: Logger | None = None,
     ) -> None:
-        self._PKCS11_key_translation = {
-            "object": (CKA_LABEL, self.__get_object_value),
-            "id": (CKA_ID, self.__get_id_value),
-            "type": (CKA_CLASS, self.__get_type_value),
-        }
         self._location: dict[str, str] = location
         self._query: dict[str, str] = query
         self._operations: list[tuple[int, str]] = []
+        # private keys already resolved, keyed weakly by the session so
+        # entries disappear together with the session they belong to
+        self._resolved_key: WeakKeyDictionary = WeakKeyDictionary()
         self._logger = logger if logger is not None else getLogger("PKCS11 uri")
 
-    def __get_object_value(self, value: str):
-        return value
-
-    def __get_id_value(self, value: str):
-        return bytes(value, "UTF-8")
-
-    def __get_type_value(self, value: str):
-        return PKCS11_type_translation.get(value, None)
-
     # If a URI contains both "pin-source" and "pin-value" query attributes, the URI SHOULD be refused as invalid.
 
     # platform independent module name
@@ -85,6 +109,29 @@ class PKCS11URI(object):
     # "type",
     # "module-name"
 
+    # split one attribute section (name=value pairs joined by ';')
+    # into a dict in a single pass
+    @staticmethod
+    def _parse_attributes(section: str, kind: str) -> dict[str, str]:
+        attributes: dict[str, str] = {}
+        for token in section.split(";"):
+            name, t_sep, value = token.partition("=")
+            if not t_sep:
+                raise Exception("Bad {0}: {1}".format(kind, section))
+            attributes[name] = _maybe_unquote(value)
+        return attributes
+
+    # fast path for the common case of an URI without query or fragment,
+    # which needs no regex splitting at all
+    @classmethod
+    def _parse_location_only(
+        cls, uri: str, logger: Logger | None
+    ) -> PKCS11URI:
+        schema, sep, rest = uri.partition(":")
+        if schema == "pkcs11" and len(rest.strip()) > 0:
+            return cls(cls._parse_attributes(rest, "location"), {}, logger)
+        return cls({}, {}, logger)
+
     @classmethod
     def parse(
         cls,
@@ -92,8 +139,9 @@ class PKCS11URI(object):
         logger: Logger | None,
     ) -> PKCS11URI:
         local_logger = logger if logger is not None else getLogger("URI parser")
-        grob = compile("(.+?)(\?.+?)?(#.+)?$")
-        m = grob.match(uri)
+        if "?" not in uri and "#" not in uri:
+            return cls._parse_location_only(uri, local_logger)
+        m = _URI_RE.match(uri)
         if m is not None:
             g = m.groups()
             if len(g) == 3:
@@ -102,36 +150,12 @@ class PKCS11URI(object):
                 if g[0] is not None:
                     schema, sep, rest = g[0].partition(":")
                     if schema == "pkcs11" and len(rest.strip()) > 0:
-                        while True:
-                            a = rest.find(";")
-                            b = rest.find("=")
-                            if a > 0 and a < b:
-                                raise Exception(
-                                    "Bad location: {0}".format(rest)
-                                )
-                            elif a < 0:
-                                location[rest[0:b]] = unquote(rest[b + 1 :])
-                                break
-                            else:
-                                location[rest[0:b]] = unquote(rest[b + 1 : a])
-                                rest = rest[a + 1 :]
+                        location = cls._parse_attributes(rest, "location")
                     else:
                         return cls({}, {}, local_logger)
                 if g[1] is not None:
                     if g[1].startswith("?"):
-                        rest = g[1][1:]
-                        while True:
-                            a = rest.find(";")
-                            b = rest.find("=")
-                            if a > 0 and a < b:
-                                raise Exception("Bad query: {0}".format(rest))
-                            elif a < 0:
-                                query[rest[0:b]] = unquote(rest[b + 1 :])
-                                break
-                            else:
-                                query[rest[0:b]] = unquote(rest[b + 1 : a])
-                                rest = rest[a + 1 :]
-
+                        query = cls._parse_attributes(g[1][1:], "query")
                     else:
                         raise Exception("Bad query in URI")
                 return cls(location, query, local_logger)
@@ -144,72 +168,66 @@ class PKCS11URI(object):
         self, norm_user: bool = True, pin_getter: Pin4Token | None = None
     ) -> Session:
         session = None
-        library = PyKCS11Lib()
-        if "module-path" in self._query:
-            library.load(self._query["module-path"])
-        else:
-            library.load()
+        library = get_library(self._query.get("module-path"))
         info = library.getInfo()
         for tag in self._location:
             if tag in CK_INFO_translation:
                 ck_tag = CK_INFO_translation[tag]
-                if self._location[tag] != info.__dict__[ck_tag].strip():
+                val = getattr(info, ck_tag).strip()
+                if self._location[tag] != val:
                     raise Exception(
                         "PKCS11 library does not corespond to URI parameters. {0} -> {1} != {2}".format(
-                            tag, self._location[tag], info.fields[ck_tag]
+                            tag, self._location[tag], val
                         )
                     )
+        # build the matching plan once instead of probing the translation
+        # dicts again for every (slot, tag) pair
+        slot_plan: list[tuple[str, str]] = []
+        token_plan: list[tuple[str, str]] = []
+        for tag, expected in self._location.items():
+            if tag in CK_SLOT_INFO_translation:
+                slot_plan.append((expected, CK_SLOT_INFO_translation[tag]))
+            if tag in CK_TOKEN_INFO_translation:
+                token_plan.append((expected, CK_TOKEN_INFO_translation[tag]))
         slots = library.getSlotList(tokenPresent=True)
         slot = None
         login_required = False
-        for sl in slots:
-            ti = library.getTokenInfo(sl)
-            si = library.getSlotInfo(sl)
-            if ti.flags & CKF_LOGIN_REQUIRED != 0:
-                login_required = True
-            if not ti.flags & CKF_TOKEN_INITIALIZED != 0:
-                del ti
-                del si
-                continue
-            found = False
-            for tag in self._location:
-                if tag in CK_SLOT_INFO_translation:
-                    ck_tag = CK_SLOT_INFO_translation[tag]
-                    found = True
-                    if self._location[tag] != si.__dict__[ck_tag].strip().strip(
-                        "\x00"
-                    ):
+        if len(slot_plan) > 0 or len(token_plan) > 0:
+            for sl in slots:
+                ti = library.getTokenInfo(sl)
+                si = library.getSlotInfo(sl)
+                if ti.flags & CKF_LOGIN_REQUIRED != 0:
+                    login_required = True
+                if not ti.flags & CKF_TOKEN_INITIALIZED != 0:
+                    del ti
+                    del si
+                    continue
+                matched = True
+                for expected, ck_tag in slot_plan:
+                    val = getattr(si, ck_tag).strip().strip("\x00")
+                    if expected != val:
                         self._logger.info(
                             "On slot '{0}' did not match '{1}'".format(
-                                self._location[tag], si.__dict__[ck_tag].strip()
+                                expected, val
                             )
                         )
-                        slot = None
+                        matched = False
                         break
-                    else:
-                        slot = sl
-                if tag in CK_TOKEN_INFO_translation:
-                    ck_tag = CK_TOKEN_INFO_translation[tag]
-                    found = True
-                    if self._location[tag] != ti.__dict__[ck_tag].strip().strip(
-                        "\x00"
-                    ):
-                        self._logger.info(
-                            "On token '{0}' did not match '{1}'".format(
-                                self._location[tag], ti.__dict__[ck_tag].strip()
+                if matched:
+                    for expected, ck_tag in token_plan:
+                        val = getattr(ti, ck_tag).strip().strip("\x00")
+                        if expected != val:
+                            self._logger.info(
+                                "On token '{0}' did not match '{1}'".format(
+                                    expected, val
+                                )
                             )
-                        )
-                        slot = None
-                        break
-                    else:
-                        slot = sl
-            del ti
-            del si
-            if found:
-                if slot is None:
-                    found = False
-                    continue
-                else:
+                            matched = False
+                            break
+                del ti
+                del si
+                if matched:
+                    slot = sl
                     break
         if slot is not None:
             session = library.openSession(
@@ -219,13 +237,12 @@ class PKCS11URI(object):
             for tag in self._location:
                 if tag in CK_SESSION_INFO_translation:
                     ck_tag = CK_SESSION_INFO_translation[tag]
-                    if self._location[tag] != ses_info.__dict__[ck_tag]:
+                    val = getattr(ses_info, ck_tag)
+                    if self._location[tag] != val:
                         session.closeSession()
                         session = None
                         raise Exception(
-                            "{0} is of value {1}".format(
-                                tag, ses_info.__dict__[ck_tag]
-                            )
+                            "{0} is of value {1}".format(tag, val)
                         )
             if session is not None:
                 pin = None
@@ -250,9 +267,9 @@ class PKCS11URI(object):
                             )
                     if pin is not None:
                         if norm_user:
-                            session.login(pin)
+                            login_session(session, pin)
                         else:
-                            session.login(pin, CKU_SO)
+                            login_session(session, pin, CKU_SO)
                     else:
                         raise Exception(
                             "Login is required, but pin was not provided"
@@ -261,9 +278,10 @@ class PKCS11URI(object):
                     self._operations = []
                     for m in mechanisms:
                         mi = library.getMechanismInfo(slot, m)
-                        for mf in mi.flags_dict:
-                            if mi.flags & mf != 0:
-                                op = mi.flags_dict[mf].replace("CKF_", "")
+                        for flag, op in get_mechanism_flag_table(
+                            mi.flags_dict
+                        ):
+                            if mi.flags & flag != 0:
                                 self._operations.append((m, op))
             else:
                 self._logger.info("Session could not be opened.")
@@ -275,17 +293,41 @@ class PKCS11URI(object):
         for m, op in self._operations:
             yield m, op
 
-    def get_key(self, session: Session) -> tuple[bytes | None, int | None, Any]:
-        template = []
+    # build a findObjects template from the location attributes,
+    # optionally forcing the object type; returns the template together
+    # with the key id and label observed in the URI
+    def _build_template(
+        self, force_type: str | None = None
+    ) -> tuple[list, bytes | None, str | None]:
+        template: list = []
+        keyid = None
+        label = None
+        typed = False
         for tag in self._location:
-            if tag in self._PKCS11_key_translation:
-                oper = self._PKCS11_key_translation[tag]
-                key = oper[0]
-                operation = oper[1]
-                val = operation(self._location[tag])
+            if tag in _PKCS11_KEY_TRANSLATION:
+                key, operation = _PKCS11_KEY_TRANSLATION[tag]
+                if force_type is not None and tag == "type":
+                    typed = True
+                    val = operation(force_type)
+                else:
+                    val = operation(self._location[tag])
+                    if tag == "object":
+                        label = val
+                    elif tag == "id":
+                        keyid = val
                 if val is not None:
                     template.append((key, val))
+        if force_type is not None and not typed:
+            key, operation = _PKCS11_KEY_TRANSLATION["type"]
+            val = operation(force_type)
+            if val is not None:
+                template.append((key, val))
+        return template, keyid, label
 
+    def get_key(self, session: Session) -> tuple[bytes | None, int | None, Any]:
+        if len(self._location) == 0:
+            return None, None, None
+        template, _, _ = self._build_template()
         if session is not None and len(template) > 0:
             objs = session.findObjects(template)
             if objs is not None and len(objs) > 0:
@@ -296,40 +338,18 @@ class PKCS11URI(object):
                 key = objs[0]
                 attrs = session.getAttributeValue(key, [CKA_KEY_TYPE, CKA_ID])
                 key_type = attrs[0]
-                keyid = bytes(attrs[1])
+                keyid = as_bytes(attrs[1])
                 return keyid, key_type, key
         return None, None, None
 
     def get_private_key(
         self, session: Session
     ) -> tuple[bytes | None, str | None, int | None, Any]:
-        template = []
-        found = False
-        keyid = None
-        label = None
-        for tag in self._location:
-            if tag in self._PKCS11_key_translation:
-                oper = self._PKCS11_key_translation[tag]
-                key = oper[0]
-                operation = oper[1]
-                if tag == "type":
-                    found = True
-                    val = operation("private")
-                else:
-                    val = operation(self._location[tag])
-                    if tag == "object":
-                        label = val
-                    elif tag == "id":
-                        keyid = val
-                if val is not None:
-                    template.append((key, val))
-        if not found:
-            oper = self._PKCS11_key_translation["type"]
-            key = oper[0]
-            operation = oper[1]
-            val = operation("private")
-            if val is not None:
-                template.append((key, val))
+        if session is not None:
+            cached = self._resolved_key.get(session)
+            if cached is not None:
+                return cached
+        template, keyid, label = self._build_template("private")
         if session is not None and len(template) > 0:
             objs = session.findObjects(template)
             if objs is not None and len(objs) > 0:
@@ -342,7 +362,8 @@ class PKCS11URI(object):
                     key, [CKA_KEY_TYPE, CKA_ID, CKA_LABEL]
                 )
                 key_type = attrs[0]
-                keyid = bytes(attrs[1])
+                keyid = as_bytes(attrs[1])
                 label = attrs[2]
+                self._resolved_key[session] = (keyid, label, key_type, key)
                 return keyid, label, key_type, key
         return keyid, label, None, None
@@ -10,6 +10,12 @@ from PyKCS11 import (
     PyKCS11Lib,
 )
 
+from pkcs11_cryptography_keys.sessions.PKCS11_session_pool import (
+    get_library,
+    login_session,
+)
+from pkcs11_cryptography_keys.utils.conversions import as_bytes
+
 from .definitions import (
     CK_INFO_translation,
     CK_SLOT_INFO_translation,
@@ -50,7 +56,7 @@ def __read_keys(
         session = library.openSession(slot, CKF_SERIAL_SESSION)
         try:
             if login_required and pin is not None:
-                session.login(pin)
+                login_session(session, pin)
             # ses_info = session.getSessionInfo()
             # slot_id = ses_info.__dict__["slotID"]
             keys = session.findObjects(template)
@@ -61,7 +67,7 @@ def __read_keys(
                 #   key_location.append("slot-id={0}".format(slot_id))
                 attrs = session.getAttributeValue(key, [CKA_LABEL, CKA_ID])
                 label = attrs[0]
-                key_id = bytes(attrs[1])
+                key_id = as_bytes(attrs[1])
                 key_location.append("object={0}".format(quote(label)))
                 key_location.append("id={0}".format(quote_from_bytes(key_id)))
                 key_location.append("type={0}".format(tp))
@@ -86,11 +92,7 @@ def get_URIs_from_module(
         query.append("module-path={0}".format(module))
     if pin is not None:
         query.append("pin-value={0}".format(pin))
-    library = PyKCS11Lib()
-    if module is not None:
-        library.load(module)
-    else:
-        library.load()
+    library = get_library(module)
     info = library.getInfo()
     if location_level & URILocationLevel.LIBRARY is not URILocationLevel.NO:
         for tag in CK_INFO_translation:
@@ -145,7 +147,6 @@ def get_URIs_from_module(
             )
         else:
             uris.append("pkcs11:{0}".format(";".join(location)))
-    del library
     if len(query) > 0:
         for i in range(len(uris)):
             uris[i] = "{0}?{1}".format(uris[i], ";".join(query))
@@ -4,20 +4,23 @@ from PyKCS11 import (
     CKA_CLASS,
     CKA_ID,
     CKA_LABEL,
-    CKF_LOGIN_REQUIRED,
-    CKF_RW_SESSION,
-    CKF_SERIAL_SESSION,
     CKO_PRIVATE_KEY,
     CKU_SO,
-    PyKCS11Lib,
+    CKU_USER,
     Session,
 )
 
 from pkcs11_cryptography_keys.card_token.PKCS11_token_admin import (
     PKCS11TokenAdmin,
 )
+from pkcs11_cryptography_keys.utils.conversions import as_bytes
 
 from .PKCS11_session import PKCS11Session
+from .PKCS11_session_pool import (
+    PKCS11SessionPool,
+    get_library,
+    login_session,
+)
 
 
 # contextmanager to facilitate connecting to source
@@ -43,6 +46,11 @@ class PKCS11AdminSession(PKCS11Session):
     # get private key id and label
     def _get_private_key_info(self, key_label: str | None = None) -> tuple:
         if self._session is not None:
+            if (
+                self._cached_key is not None
+                and self._cached_key_label == key_label
+            ):
+                return self._cached_key
             private_key = None
             if key_label is None:
                 private_key_s = self._session.findObjects(
@@ -66,9 +74,11 @@ class PKCS11AdminSession(PKCS11Session):
                     private_key,
                     [CKA_ID, CKA_LABEL],
                 )
-                keyid = bytes(attrs[0])
+                keyid = as_bytes(attrs[0])
                 label = attrs[1].strip().strip("\x00")
-                return keyid, label
+                self._cached_key_label = key_label
+                self._cached_key = (keyid, label)
+                return self._cached_key
             else:
                 self._logger.info("Private key not found")
         else:
@@ -78,30 +88,31 @@ class PKCS11AdminSession(PKCS11Session):
     # Open session with the card
     # Uses pin if needed, reads permited operations(mechanisms)
     def open(self) -> PKCS11TokenAdmin | None:
-        library = PyKCS11Lib()
-        library.load(self._pksc11_lib)
-        slots = library.getSlotList(tokenPresent=True)
+        library = get_library(self._pksc11_lib)
+        pool = PKCS11SessionPool.instance()
+        pool_key = (
+            self._pksc11_lib,
+            self._token_label,
+            CKU_USER if self._norm_user else CKU_SO,
+        )
         slot = None
-
-        for sl in slots:
-            ti = library.getTokenInfo(sl)
-            if ti.flags & CKF_LOGIN_REQUIRED != 0:
-                self._login_required = True
-            if self._token_label is None:
-                slot = sl
-            if ti.label.strip() == self._token_label:
-                slot = sl
-                break
-        if slot is not None:
-            self._session = library.openSession(
-                slot, CKF_SERIAL_SESSION | CKF_RW_SESSION
+        self._session = pool.checkout(pool_key)
+        if self._session is not None:
+            self._pool_key = pool_key
+            slot = self._session.getSessionInfo().slotID
+        else:
+            slot, self._session = self._open_token_session(
+                library, self._pksc11_lib, self._token_label
             )
             if self._session is not None:
                 if self._login_required:
                     if self._norm_user:
-                        self._session.login(self._pin)
+                        login_session(self._session, self._pin)
                     else:
-                        self._session.login(self._pin, CKU_SO)
+                        login_session(self._session, self._pin, CKU_SO)
+                self._pool_key = pool_key
+        if slot is not None:
+            if self._session is not None:
                 pk_info = self._get_private_key_info(self._key_label)
                 if pk_info is not None:
                     keyid, label = pk_info
@@ -6,20 +6,28 @@ from PyKCS11 import (
     CKA_ID,
     CKA_KEY_TYPE,
     CKA_LABEL,
-    CKF_LOGIN_REQUIRED,
-    CKF_RW_SESSION,
-    CKF_SERIAL_SESSION,
     CKK_ECDSA,
     CKK_RSA,
     CKO_PRIVATE_KEY,
-    PyKCS11Lib,
+    CKU_USER,
     Session,
 )
 
 from pkcs11_cryptography_keys.keys.ec import EllipticCurvePrivateKeyPKCS11
 from pkcs11_cryptography_keys.keys.rsa import RSAPrivateKeyPKCS11
+from pkcs11_cryptography_keys.utils.conversions import as_bytes
+from pkcs11_cryptography_keys.utils.mechanisms import (
+    get_mechanism_flag_table,
+)
 
 from .PKCS11_session import PKCS11Session
+from .PKCS11_session_pool import (
+    PKCS11SessionPool,
+    get_cached_mechanisms,
+    get_library,
+    login_session,
+    set_cached_mechanisms,
+)
 
 _key_modules = {
     CKK_ECDSA: "pkcs11_cryptography_keys.keys.ec",
@@ -46,6 +54,11 @@ class PKCS11KeySession(PKCS11Session):
     # get private key reference and get key type and keyid for it
     def _get_private_key(self, key_label: str | None = None) -> tuple:
         if self._session is not None:
+            if (
+                self._cached_key is not None
+                and self._cached_key_label == key_label
+            ):
+                return self._cached_key
             if key_label is None:
                 private_key = self._session.findObjects(
                     [
@@ -63,8 +76,10 @@ class PKCS11KeySession(PKCS11Session):
                 private_key, [CKA_KEY_TYPE, CKA_ID]
             )
             key_type = attrs[0]
-            keyid = bytes(attrs[1])
-            return keyid, key_type, private_key
+            keyid = as_bytes(attrs[1])
+            self._cached_key_label = key_label
+            self._cached_key = (keyid, key_type, private_key)
+            return self._cached_key
         else:
             self._logger.info("PKCS11 session is ot present")
         return None, None, None
@@ -75,27 +90,26 @@ class PKCS11KeySession(PKCS11Session):
         self,
     ) -> EllipticCurvePrivateKeyPKCS11 | RSAPrivateKeyPKCS11 | None:
         private_key = None
-        library = PyKCS11Lib()
-        library.load(self._pksc11_lib)
-        slots = library.getSlotList(tokenPresent=True)
+        library = get_library(self._pksc11_lib)
+        pool = PKCS11SessionPool.instance()
+        pool_key = (self._pksc11_lib, self._token_label, CKU_USER)
+        token_key = (self._pksc11_lib, self._token_label)
         slot = None
         self._login_required = False
-        for sl in slots:
-            ti = library.getTokenInfo(sl)
-            if ti.flags & CKF_LOGIN_REQUIRED != 0:
-                self._login_required = True
-            if self._token_label is None:
-                slot = sl
-            if ti.label.strip() == self._token_label:
-                slot = sl
-                break
-        if slot is not None:
-            self._session = library.openSession(
-                slot, CKF_SERIAL_SESSION | CKF_RW_SESSION
+        self._session = pool.checkout(pool_key)
+        if self._session is not None:
+            self._pool_key = pool_key
+            slot = self._session.getSessionInfo().slotID
+        else:
+            slot, self._session = self._open_token_session(
+                library, self._pksc11_lib, self._token_label
             )
             if self._session is not None:
                 if self._login_required:
-                    self._session.login(self._pin)
+                    login_session(self._session, self._pin)
+                self._pool_key = pool_key
+        if slot is not None:
+            if self._session is not None:
                 keyid, key_type, pk_ref = self._get_private_key(self._key_label)
                 module = None
                 module_name = _key_modules.get(key_type, None)
@@ -111,13 +125,20 @@ class PKCS11KeySession(PKCS11Session):
                         keyid,
                         pk_ref,
                     )
-                    mechanisms = library.getMechanismList(slot)
-                    for m in mechanisms:
-                        mi = library.getMechanismInfo(slot, m)
-                        for mf in mi.flags_dict:
-                            if mi.flags & mf != 0:
-                                op = mi.flags_dict[mf].replace("CKF_", "")
-                                private_key.fill_operations(m, op)
+                    operations = get_cached_mechanisms(token_key)
+                    if operations is None:
+                        operations = []
+                        mechanisms = library.getMechanismList(slot)
+                        for m in mechanisms:
+                            mi = library.getMechanismInfo(slot, m)
+                            for flag, op in get_mechanism_flag_table(
+                                mi.flags_dict
+                            ):
+                                if mi.flags & flag != 0:
+                                    operations.append((m, op))
+                        set_cached_mechanisms(token_key, operations)
+                    for m, op in operations:
+                        private_key.fill_operations(m, op)
             else:
                 self._logger.info("PKCS11 session could not be opened")
         else:
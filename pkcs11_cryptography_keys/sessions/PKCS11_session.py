@@ -1,5 +1,22 @@
 from logging import Logger, getLogger
 
+from PyKCS11 import (
+    CKF_LOGIN_REQUIRED,
+    CKF_RW_SESSION,
+    CKF_SERIAL_SESSION,
+    CKR_TOKEN_NOT_PRESENT,
+    PyKCS11Error,
+    PyKCS11Lib,
+    Session,
+)
+
+from .PKCS11_session_pool import (
+    PKCS11SessionPool,
+    get_cached_slot,
+    invalidate_token_cache,
+    set_cached_slot,
+)
+
 
 # contextmanager to facilitate connecting to card token
 class PKCS11Session(object):
@@ -8,13 +25,79 @@ class PKCS11Session(object):
             logger if logger is not None else getLogger("PKCS11 session")
         )
         # session for interacton with the card
-        self._session = None
+        self._session: Session | None = None
         # does user need to be logged in to use session
         self._login_required = False
+        # pool key when the session is held for reuse by the session pool
+        self._pool_key: tuple | None = None
+        # cached private key lookup result and the label it was found for,
+        # so repeated access does not search the token again
+        self._cached_key_label: str | None = None
+        self._cached_key: tuple | None = None
+
+    # Find the slot holding the token with the given label and whether
+    # login is required; memoized per (library path, token label) since
+    # the answer is static while the token stays in its slot
+    def _select_slot(
+        self,
+        library: PyKCS11Lib,
+        pksc11_lib: str | None,
+        token_label: str | None,
+    ) -> tuple[int | None, bool]:
+        token_key = (pksc11_lib, token_label)
+        cached = get_cached_slot(token_key)
+        if cached is not None:
+            return cached
+        slot = None
+        login_required = False
+        slots = library.getSlotList(tokenPresent=True)
+        for sl in slots:
+            ti = library.getTokenInfo(sl)
+            if ti.flags & CKF_LOGIN_REQUIRED != 0:
+                login_required = True
+            if token_label is None:
+                slot = sl
+            if ti.label.strip() == token_label:
+                slot = sl
+                break
+        if slot is not None:
+            set_cached_slot(token_key, slot, login_required)
+        return slot, login_required
+
+    # Select the slot (possibly from the cache) and open a session on it.
+    # A cached slot goes stale when the token is removed; in that case the
+    # cache entry is dropped and the scan is retried once
+    def _open_token_session(
+        self,
+        library: PyKCS11Lib,
+        pksc11_lib: str | None,
+        token_label: str | None,
+    ) -> tuple[int | None, Session | None]:
+        slot, self._login_required = self._select_slot(
+            library, pksc11_lib, token_label
+        )
+        if slot is None:
+            return None, None
+        try:
+            return slot, library.openSession(
+                slot, CKF_SERIAL_SESSION | CKF_RW_SESSION
+            )
+        except PyKCS11Error as ex:
+            if ex.value != CKR_TOKEN_NOT_PRESENT:
+                raise
+            invalidate_token_cache((pksc11_lib, token_label))
+        slot, self._login_required = self._select_slot(
+            library, pksc11_lib, token_label
+        )
+        if slot is None:
+            return None, None
+        return slot, library.openSession(
+            slot, CKF_SERIAL_SESSION | CKF_RW_SESSION
+        )
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
         ret = False
-        self.close()
+        self.close(discard=exc_type is not None)
         if exc_type is not None:
             self._logger.error(
                 "PKCS11 session experienced an error : %s",
@@ -27,7 +110,7 @@ class PKCS11Session(object):
 
     async def __aexit__(self, exc_type, exc_value, exc_traceback):
         ret = False
-        self.close()
+        self.close(discard=exc_type is not None)
         if exc_type is not None:
             self._logger.error(
                 "PKCS11 session experienced an error : %s",
@@ -39,9 +122,24 @@ class PKCS11Session(object):
         return ret
 
     # Closing work on an open session
-    def close(self):
+    # Pooled sessions are kept logged in and returned to the pool,
+    # unless discard is set because the session may be operationally
+    # broken (the with block died with an exception)
+    def close(self, discard: bool = False):
         if self._session is not None:
-            if self._login_required:
-                self._session.logout()
-            self._session.closeSession()
-            self._session = None
+            try:
+                if self._pool_key is not None and not discard:
+                    PKCS11SessionPool.instance().checkin(
+                        self._pool_key, self._session
+                    )
+                else:
+                    if self._login_required:
+                        self._session.logout()
+                    self._session.closeSession()
+            finally:
+                # drop the references even when logout/close fails, so a
+                # broken session is never handed out again
+                self._session = None
+                self._pool_key = None
+                self._cached_key_label = None
+                self._cached_key = None
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import atexit
+from logging import Logger, getLogger
+from queue import Empty, Queue
+from threading import Lock
+
+from PyKCS11 import (
+    CKR_USER_ALREADY_LOGGED_IN,
+    PyKCS11Error,
+    PyKCS11Lib,
+    Session,
+)
+
+# loaded PKCS11 libraries by library path
+# load() performs dlopen and C_Initialize, which is expensive,
+# so it is done once per library path for the whole process
+_libraries: dict[str | None, PyKCS11Lib] = {}
+_library_lock = Lock()
+
+
+def get_library(pksc11_lib: str | None) -> PyKCS11Lib:
+    with _library_lock:
+        library = _libraries.get(pksc11_lib)
+        if library is None:
+            library = PyKCS11Lib()
+            if pksc11_lib is not None:
+                library.load(pksc11_lib)
+            else:
+                library.load()
+            _libraries[pksc11_lib] = library
+        return library
+
+
+# Log a session in, tolerating a token that is already logged in.
+# PKCS11 login state is per token and shared by all sessions of the
+# application, so a pooled session may have logged the token in already
+def login_session(session: Session, pin: str | None, user_type=None) -> None:
+    try:
+        if user_type is None:
+            session.login(pin)
+        else:
+            session.login(pin, user_type)
+    except PyKCS11Error as ex:
+        if ex.value != CKR_USER_ALREADY_LOGGED_IN:
+            raise
+
+
+# slot number and login requirement by (library path, token label)
+# both are static for a token as long as it stays in its slot
+_slot_cache: dict[tuple, tuple[int, bool]] = {}
+# mechanism operations by (library path, token label)
+_mechanism_cache: dict[tuple, list[tuple[int, str]]] = {}
+_token_cache_lock = Lock()
+
+
+def get_cached_slot(key: tuple) -> tuple[int, bool] | None:
+    with _token_cache_lock:
+        return _slot_cache.get(key)
+
+
+def set_cached_slot(key: tuple, slot: int, login_required: bool) -> None:
+    with _token_cache_lock:
+        _slot_cache[key] = (slot, login_required)
+
+
+def get_cached_mechanisms(key: tuple) -> list[tuple[int, str]] | None:
+    with _token_cache_lock:
+        return _mechanism_cache.get(key)
+
+
+def set_cached_mechanisms(
+    key: tuple, operations: list[tuple[int, str]]
+) -> None:
+    with _token_cache_lock:
+        _mechanism_cache[key] = operations
+
+
+# forget cached token data, used when the token is no longer present
+def invalidate_token_cache(key: tuple) -> None:
+    with _token_cache_lock:
+        _slot_cache.pop(key, None)
+        _mechanism_cache.pop(key, None)
+
+
+# close idle sessions and drop the library references on interpreter
+# shutdown so PyKCS11Lib can run C_Finalize
+def _cleanup_at_exit() -> None:
+    PKCS11SessionPool.instance().clear()
+    with _library_lock:
+        _libraries.clear()
+
+
+atexit.register(_cleanup_at_exit)
+
+
+# pool of logged-in sessions to facilitate session reuse
+class PKCS11SessionPool(object):
+    _instance: PKCS11SessionPool | None = None
+    _instance_lock = Lock()
+
+    def __init__(self, logger: Logger | None = None):
+        self._logger = (
+            logger if logger is not None else getLogger("PKCS11 session pool")
+        )
+        self._lock = Lock()
+        # idle sessions keyed by (library path, token label, user type)
+        self._sessions: dict[tuple, Queue] = {}
+
+    # process-wide pool instance
+    @classmethod
+    def instance(cls) -> PKCS11SessionPool:
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def _get_queue(self, key: tuple) -> Queue:
+        with self._lock:
+            queue = self._sessions.get(key)
+            if queue is None:
+                queue = Queue()
+                self._sessions[key] = queue
+            return queue
+
+    # Hand out an idle session for the key or None if there is none.
+    # Dead sessions (card removed, session closed) are discarded.
+    def checkout(self, key: tuple) -> Session | None:
+        queue = self._get_queue(key)
+        while True:
+            try:
+                session = queue.get_nowait()
+            except Empty:
+                return None
+            try:
+                session.getSessionInfo()
+            except PyKCS11Error:
+                self._logger.info("Discarding dead PKCS11 session")
+                continue
+            return session
+
+    # Return a session to the pool for later reuse
+    def checkin(self, key: tuple, session: Session) -> None:
+        self._get_queue(key).put(session)
+
+    # Close all idle sessions held by the pool
+    def clear(self) -> None:
+        with self._lock:
+            queues = list(self._sessions.values())
+            self._sessions.clear()
+        for queue in queues:
+            while True:
+                try:
+                    session = queue.get_nowait()
+                except Empty:
+                    break
+                try:
+                    session.closeSession()
+                except PyKCS11Error:
+                    self._logger.info("Pooled session was already closed")
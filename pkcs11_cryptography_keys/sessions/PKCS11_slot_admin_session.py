@@ -1,17 +1,11 @@
 from logging import Logger
 
-from PyKCS11 import (
-    CKF_LOGIN_REQUIRED,
-    CKF_RW_SESSION,
-    CKF_SERIAL_SESSION,
-    CKU_SO,
-    PyKCS11Lib,
-    Session,
-)
+from PyKCS11 import CKU_SO, Session
 
 from pkcs11_cryptography_keys.card_slot.PKCS11_slot_admin import PKCS11SlotAdmin
 
 from .PKCS11_session import PKCS11Session
+from .PKCS11_session_pool import get_library, login_session
 
 
 # contextmanager to facilitate connecting to source
@@ -33,30 +27,17 @@ class PKCS11SlotAdminSession(PKCS11Session):
     # Open session with the card
     # Uses pin if needed, reads permited operations(mechanisms)
     def open(self) -> PKCS11SlotAdmin | None:
-        library = PyKCS11Lib()
-        library.load(self._pksc11_lib)
-        slots = library.getSlotList(tokenPresent=True)
-        slot = None
-        self._login_required = False
-        for sl in slots:
-            ti = library.getTokenInfo(sl)
-            if ti.flags & CKF_LOGIN_REQUIRED != 0:
-                self._login_required = True
-            if self._token_label is None:
-                slot = sl
-            if ti.label.strip() == self._token_label:
-                slot = sl
-                break
+        library = get_library(self._pksc11_lib)
+        slot, self._session = self._open_token_session(
+            library, self._pksc11_lib, self._token_label
+        )
         if slot is not None:
-            self._session = library.openSession(
-                slot, CKF_SERIAL_SESSION | CKF_RW_SESSION
-            )
             if self._session is not None:
                 if self._login_required:
                     if self._norm_user:
-                        self._session.login(self._pin)
+                        login_session(self._session, self._pin)
                     else:
-                        self._session.login(self._pin, CKU_SO)
+                        login_session(self._session, self._pin, CKU_SO)
                 return PKCS11SlotAdmin(self._session)
             else:
                 self._logger.info("PKCS11 sessin could not be opened")
@@ -1,16 +1,11 @@
 from logging import Logger
 
-from PyKCS11 import (
-    CKF_LOGIN_REQUIRED,
-    CKF_RW_SESSION,
-    CKF_SERIAL_SESSION,
-    PyKCS11Lib,
-    Session,
-)
+from PyKCS11 import Session
 
 from pkcs11_cryptography_keys.card_slot.PKCS11_slot import PKCS11Slot
 
 from .PKCS11_session import PKCS11Session
+from .PKCS11_session_pool import get_library, login_session
 
 
 # contextmanager to facilitate connecting to source
@@ -30,27 +25,14 @@ class PKCS11SlotSession(PKCS11Session):
     # Open session with the card
     # Uses pin if needed, reads permited operations(mechanisms)
     def open(self) -> PKCS11Slot | None:
-        library = PyKCS11Lib()
-        library.load(self._pksc11_lib)
-        slots = library.getSlotList(tokenPresent=True)
-        slot = None
-        self._login_required = False
-        for sl in slots:
-            ti = library.getTokenInfo(sl)
-            if ti.flags & CKF_LOGIN_REQUIRED != 0:
-                self._login_required = True
-            if self._token_label is None:
-                slot = sl
-            if ti.label.strip() == self._token_label:
-                slot = sl
-                break
+        library = get_library(self._pksc11_lib)
+        slot, self._session = self._open_token_session(
+            library, self._pksc11_lib, self._token_label
+        )
         if slot is not None:
-            self._session = library.openSession(
-                slot, CKF_SERIAL_SESSION | CKF_RW_SESSION
-            )
             if self._session is not None:
                 if self._login_required:
-                    self._session.login(self._pin)
+                    login_session(self._session, self._pin)
                 return PKCS11Slot(self._session)
             else:
                 self._logger.info("PKCS11 sessin could not be opened")
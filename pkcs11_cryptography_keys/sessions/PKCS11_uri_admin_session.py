@@ -17,6 +17,7 @@ from pkcs11_cryptography_keys.card_token.PKCS11_token_admin import (
     PKCS11TokenAdmin,
 )
 from pkcs11_cryptography_keys.pkcs11_URI.pkcs11_URI import PKCS11URI
+from pkcs11_cryptography_keys.utils.conversions import as_bytes
 from pkcs11_cryptography_keys.utils.pin_4_token import Pin4Token
 
 from .PKCS11_session import PKCS11Session
@@ -62,7 +63,7 @@ class PKCS11URIAdminSession(PKCS11Session):
                     private_key,
                     [CKA_ID, CKA_LABEL],
                 )
-                keyid = bytes(attrs[0])
+                keyid = as_bytes(attrs[0])
                 label = attrs[1]
                 return keyid, label
             else:
@@ -0,0 +1,7 @@
+# Return the value as bytes, avoiding a copy when it already is one.
+# PyKCS11 hands attribute data back as ckbytelist, which bytes()
+# converts through the buffer protocol.
+def as_bytes(value) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    return bytes(value)
@@ -1,10 +1,11 @@
 from logging import Logger
 
-from PyKCS11 import CKF_TOKEN_INITIALIZED, PyKCS11Lib
+from PyKCS11 import CKF_TOKEN_INITIALIZED
 
 from pkcs11_cryptography_keys.sessions.PKCS11_admin_session import (
     PKCS11AdminSession,
 )
+from pkcs11_cryptography_keys.sessions.PKCS11_session_pool import get_library
 
 
 # Support function to list admin sessions
@@ -14,8 +15,7 @@ def list_token_admins(
     norm_user: bool = False,
     logger: Logger | None = None,
 ):
-    library = PyKCS11Lib()
-    library.load(pksc11_lib)
+    library = get_library(pksc11_lib)
     slots = library.getSlotList(tokenPresent=True)
     for sl in slots:
         ti = library.getTokenInfo(sl)
@@ -27,8 +27,7 @@ def list_token_admins(
 
 # Support function to list token labels
 def list_token_labels(pksc11_lib: str):
-    library = PyKCS11Lib()
-    library.load(pksc11_lib)
+    library = get_library(pksc11_lib)
     slots = library.getSlotList(tokenPresent=True)
     for sl in slots:
         ti = library.getTokenInfo(sl)
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+# mechanism flag bits with the CKF_ prefix already stripped,
+# built lazily from the first mechanism info seen; the flag naming
+# dict is the same for every mechanism
+_flag_table: list[tuple[int, str]] | None = None
+
+
+def get_mechanism_flag_table(
+    flags_dict: dict[int, str]
+) -> list[tuple[int, str]]:
+    global _flag_table
+    if _flag_table is None:
+        _flag_table = [
+            (flag, name[4:] if name.startswith("CKF_") else name)
+            for flag, name in flags_dict.items()
+        ]
+    return _flag_table